@@ -18,6 +18,8 @@ def translate_gene_name(gene_name):
 with open('/pollard/home/kathleen/projects/AlleleAnalyzer/manuscript_analyses/1000genomes_analysis/get_gene_list/genes_hg19.txt','r') as f:
 	genes = f.read().splitlines()
 
+merged = []
+
 for gene in genes:
 	fpath = f'/pollard/data/projects/AlleleAnalyzer_data/1kgp_data/hg19_analysis/1kgp_excisionfinder_results/results_by_chrom_5kb_window/{chrom}_ef_results/{gene}.h5'
 	if os.path.exists(fpath):
@@ -25,8 +27,14 @@ for gene in genes:
 		gene_name_t = translate_gene_name(gene)
 		store.append(gene_name_t, region_df, mode='a', index=False, format='table', append=True, 
 			data_columns=['sample'])
+		merged.append(gene_name_t)
 	else:
 		continue
 
+# add a full index on sample to each merged table; building it once after all rows are written
+# costs one extra pass over the store but makes later per-sample queries much faster
+for gene_name_t in merged:
+	store.create_table_index(gene_name_t, columns=['sample'], optlevel=9, kind='full')
+
 store.close()
 print(f'Chromosome {chrom} complete.')
\ No newline at end of file
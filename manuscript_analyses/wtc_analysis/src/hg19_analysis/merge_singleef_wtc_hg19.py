@@ -0,0 +1,58 @@
+"""
+python merge_singleef_wtc_hg19.py chrom [n_procs]
+Per-gene results are read in n_procs worker processes (default 4) and written to the
+chromosome's HDF5 file by the main process only, since HDF5 writes can't be shared.
+"""
+
+import pandas as pd
+import os, sys
+from functools import reduce
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+results_dir = '/pollard/data/projects/AlleleAnalyzer_data/wtc_data/hg19/wtc_single_targ2/'
+
+def translate_gene_name(gene_name):
+    """
+    HDF5 throws all sort of errors when you have weird punctuation in the gene name, so
+    this translates it to a less offensive form.
+    """
+    repls = ("-", "dash"), (".", "period")
+    trans_gene_name = reduce(lambda a, kv: a.replace(*kv), repls, str(gene_name))
+    return trans_gene_name
+
+def read_gene(gene, fpath):
+	# open the per-gene file once explicitly instead of letting pd.read_hdf reopen it
+	with pd.HDFStore(fpath, mode='r') as gene_store:
+		region_df = gene_store.select('all')
+	return translate_gene_name(gene), region_df
+
+if __name__ == '__main__':
+	chrom='chr' + str(sys.argv[1])
+	n_procs = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+	with open('/pollard/home/kathleen/projects/AlleleAnalyzer/manuscript_analyses/1000genomes_analysis/get_gene_list/genes_hg19.txt','r') as f:
+		genes = f.read().splitlines()
+
+	# only hand extant files to the workers
+	fpaths = {gene: f'{results_dir}{chrom}_results/{gene}.h5' for gene in genes}
+	fpaths = {gene: fpath for gene, fpath in fpaths.items() if os.path.exists(fpath)}
+
+	store = pd.HDFStore(f'{results_dir}{chrom}_results.h5')
+
+	merged = []
+
+	with ProcessPoolExecutor(max_workers=n_procs) as executor:
+		futures = [executor.submit(read_gene, gene, fpath) for gene, fpath in fpaths.items()]
+		for future in as_completed(futures):
+			gene_name_t, region_df = future.result()
+			# each gene has its own table and a single frame, so write it in one call; put also
+			# replaces any table left over from an earlier run instead of appending duplicate rows
+			store.put(gene_name_t, region_df, index=False, format='table', data_columns=['sample'])
+			merged.append(gene_name_t)
+
+	# build the sample index once per table now that all rows are written, rather than on every append
+	for gene_name_t in merged:
+		store.create_table_index(gene_name_t, columns=['sample'], optlevel=9, kind='full')
+
+	store.close()
+	print(f'Chromosome {chrom} complete.')
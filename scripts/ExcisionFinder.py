@@ -6,7 +6,7 @@ ExcisionFinder identifies allele-specific excision sites. Written in Python vers
 Kathleen Keough et al 2017-2018.
 
 Usage: 
-        ExcisionFinder.py [-vsgc] <gene_dat> <gene> <annots_file> <maxcut> <cas_list> <bcf> <out> [--window=<window_in_bp>] [--not_phased] [--guides=<guides>] [--exhaustive]
+        ExcisionFinder.py [-vsgc] <gene_dat> <gene> <annots_file> <maxcut> <cas_list> <bcf> <out> [--window=<window_in_bp>] [--not_phased] [--guides=<guides>] [--exhaustive] [--procs=<procs>]
         ExcisionFinder.py -h
 
 Arguments:
@@ -28,6 +28,7 @@ Options:
                                      on same haplotype.
     --guides=<guides>                Guides file for locus if '-g' specified.
     --exhaustive                     Run exhaustive style analysis (e.g. for set cover analysis)
+    --procs=<procs>                  Number of processes used to evaluate Cas varieties in parallel [default: 1].
 
 Available Cas types = cpf1,SpCas9,SpCas9_VRER,SpCas9_EQR,SpCas9_VQR_1,SpCas9_VQR_2,StCas9,StCas9_2,SaCas9,SaCas9_KKH,nmCas9,cjCas9
 """
@@ -35,13 +36,12 @@ Available Cas types = cpf1,SpCas9,SpCas9_VRER,SpCas9_EQR,SpCas9_VQR_1,SpCas9_VQR
 import pandas as pd
 from pandas import HDFStore
 import numpy as np
-from functools import reduce
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from docopt import docopt
-import itertools
 import regex as re
 import logging
 import subprocess
-from io import StringIO
 import os, sys
 import time
 import cas_object as cas_obj
@@ -54,6 +54,22 @@ from get_metadata import add_metadata
 
 __version__ = '0.0.0'
 
+# phased genotypes relabelled by the haplotype that carries the alternate allele
+HAP_LABELS = {
+    "0|1": "hap2",
+    "0|2": "hap2",
+    "0|3": "hap2",
+    "1|0": "hap1",
+    "2|0": "hap1",
+    "3|0": "hap1",
+    "0|0": "not_het",
+    "1|1": "not_het",
+}
+
+# punctuation in gene names that HDF5 keys can't hold, and what it is spelled out as
+GENE_NAME_REPLS = {"-": "dash", ".": "period"}
+GENE_NAME_PUNCT = re.compile(r"[-.]")
+
 
 def load_gene_gene_dat(gene_dat_path):
     """
@@ -93,39 +109,91 @@ def het(genotype):
     return hap1 != hap2
 
 
-def next_exon(variant_position, coding_exon_starts):
+def het_matrix(gens):
     """
-    get location of next coding exon after variant
-    :param coding_exon_starts: coding exon start positions, Pandas Series.
-    :param variant_position: chromosomal position, int
-    :return: chromosomal position of start of next coding exon, int
+    Determine which genotypes in a variants x samples genotype table are het, comparing the
+    two allele characters of all 3 character genotypes (e.g. 0|1) at once.
+    :param gens: genotypes, one column per sample, Pandas DataFrame.
+    :return: bool array of the same shape, True = het, False = hom, NumPy array.
     """
-    greater_than_var = [x for x in coding_exon_starts if x > variant_position]
-    if not greater_than_var:
-        return False
-    else:
-        next_coding_exon_pos = min(greater_than_var)
-        return next_coding_exon_pos
+    gts = gens.to_numpy(dtype=str)
+    het_mat = np.zeros(gts.shape, dtype=bool)
+    simple = np.char.str_len(gts) == 3
+    alleles = gts[simple].astype("U3").view("U1").reshape(-1, 3)
+    het_mat[simple] = alleles[:, 0] != alleles[:, 2]
+    # multi-character alleles (e.g. 10|11) and genotypes with other FORMAT fields fall back to het()
+    for ix in zip(*np.nonzero(~simple)):
+        het_mat[ix] = het(gts[ix])
+    return het_mat
+
+
+def in_coding(positions, coding_exon_starts, coding_exon_ends):
+    """
+    Determine which positions fall within a coding exon (inclusive of both ends).
+    :param positions: chromosomal positions, int or NumPy array.
+    :param coding_exon_starts: Start positions of coding exons in transcript order, NumPy array.
+    :param coding_exon_ends: End positions of coding exons, NumPy array.
+    :return: True = coding, False = not coding, bool or NumPy bool array.
+    """
+    # exons clipped to nothing by the CDS bounds (start > end) hold no coding positions, and
+    # dropping them leaves the rest in ascending order for the binary search
+    nonempty = coding_exon_starts <= coding_exon_ends
+    coding_exon_starts, coding_exon_ends = coding_exon_starts[nonempty], coding_exon_ends[nonempty]
+    if not coding_exon_starts.size:
+        return np.zeros(np.shape(positions), dtype=bool)
+    # the exon (if any) each position could fall in is the last one starting at or before it
+    ix = np.searchsorted(coding_exon_starts, positions, side="right") - 1
+    return (ix >= 0) & (positions <= coding_exon_ends[np.clip(ix, 0, None)])
+
+
+def get_targ_pairs(variants, maxcut, coding_exon_starts, coding_exon_ends):
+    """
+    Get pairs of variant positions within maxcut of each other that are targetable based on
+    whether they might disrupt an exon, in both orders.
+    :param variants: variant positions, NumPy array.
+    :param maxcut: maximum distance between cut position pairs, int.
+    :param coding_exon_starts: start positions of coding exons in transcript order (need not be sorted), NumPy array.
+    :param coding_exon_ends: end positions of coding exons, NumPy array.
+    :return: first and second variant position of each targetable pair, NumPy arrays.
+    """
+    variants = np.sort(variants)
+    # each variant pairs with every later variant at a different position up to maxcut away
+    first = np.searchsorted(variants, variants, side="right")
+    last = np.searchsorted(variants, variants + maxcut, side="right")
+    n_partners = last - first
+    low = np.repeat(np.arange(len(variants)), n_partners)
+    offset = np.arange(n_partners.sum()) - np.repeat(np.cumsum(n_partners) - n_partners, n_partners)
+    high = first[low] + offset
+    # a pair is targetable if either variant is coding or it spans the start of the next coding exon
+    coding = in_coding(variants, coding_exon_starts, coding_exon_ends)
+    # the first start is clipped up to cdsStart, which puts it after later starts when the leading
+    # exons are all UTR, so the next exon is looked up in a sorted copy
+    next_exon_starts = np.sort(coding_exon_starts)
+    next_exon = np.searchsorted(next_exon_starts, variants, side="right")
+    has_next_exon = next_exon < len(next_exon_starts)
+    next_exon_start = next_exon_starts[np.minimum(next_exon, len(next_exon_starts) - 1)]
+    targetable = (
+        coding[low]
+        | coding[high]
+        | (has_next_exon[low] & (variants[high] >= next_exon_start[low]))
+    )
+    low, high = low[targetable], high[targetable]
+    # order both orders of each pair by row in the sorted positions, as itertools.product over them
+    # would, so pairs sharing a repeated position stay interleaved by row rather than grouped by value
+    row1 = np.concatenate([low, high])
+    row2 = np.concatenate([high, low])
+    order = np.lexsort((row2, row1))
+    return variants[row1[order]], variants[row2[order]]
 
 
-def targ_pair(variant1, variant2, coding_positions, coding_exon_starts):
+def same_hap(pairs, ind_haps):
     """
-    Determine whether a pair of variants positions is targetable based on whether they might
-    disrupt an exon.
-    :param variant1: position of variant 1, int.
-    :param variant2: position of variant 2, int.
-    :param coding_positions: coding positions, set.
-    :param coding_exon_starts: Start positions of coding exons, Pandas Series.
-    :return: whether targetable or not, bool.
+    Determine whether both variants in each pair are on the same haplotype in an individual.
+    :param pairs: variant pairs, Pandas DataFrame with var1 and var2 columns.
+    :param ind_haps: haplotype label of each variant for the individual, Pandas Series indexed by position.
+    :return: whether each pair is on the same haplotype, NumPy bool array.
     """
-    low_var, high_var = sorted([variant1, variant2])
-    if low_var in coding_positions or high_var in coding_positions:
-        return True
-    elif next_exon(low_var, coding_exon_starts):
-        # checks whether larger variant position occurs in or after next exon
-        return bool(high_var >= next_exon(low_var, coding_exon_starts))
-    else:
-        return False
+    return pairs["var1"].map(ind_haps).values == pairs["var2"].map(ind_haps).values
 
 
 def translate_gene_name(gene_name):
@@ -133,8 +201,9 @@ def translate_gene_name(gene_name):
     HDF5 throws all sort of errors when you have weird punctuation in the gene name, so
     this translates it to a less offensive form.
     """
-    repls = ("-", "dash"), (".", "period")
-    trans_gene_name = reduce(lambda a, kv: a.replace(*kv), repls, str(gene_name))
+    trans_gene_name = GENE_NAME_PUNCT.sub(
+        lambda match: GENE_NAME_REPLS[match.group()], str(gene_name)
+    )
     return trans_gene_name
 
 
@@ -143,40 +212,32 @@ class Gene:
 
     def __init__(self, official_gene_symbol, gene_dat, window):
         self.official_gene_symbol = official_gene_symbol
-        self.info = gene_dat.query("index == @self.official_gene_symbol")
+        # look the transcript up once by its index label; every attribute below reads this row
+        self.info = gene_dat.loc[[self.official_gene_symbol]]
         self.n_exons = self.info["exonCount"].item()
         self.coding_start = int(self.info["cdsStart"].item())
         self.coding_end = int(self.info["cdsEnd"].item())
-        self.coding_exons = []
-        counter = 0
-        counterweight = len(list(
-                zip(
-                    list(map(int, self.info["exonStarts"].item().split(",")[:-1])),
-                    list(map(int, self.info["exonEnds"].item().split(",")[:-1])),
-                )))
-        for x in list(zip(list(map(int, self.info["exonStarts"].item().split(",")[:-1])),
-                      list(map(int, self.info["exonEnds"].item().split(",")[:-1])))):
-            counter += 1
-            if counter == 1:
-                self.coding_exons.append((max(self.coding_start, x[0]), x[1]))
-            elif counter == counterweight:
-                self.coding_exons.append((x[0], min(self.coding_end, x[1])))
-            else:
-                self.coding_exons.append((x[0], x[1]))
+        exon_starts = np.array(self.info["exonStarts"].item().split(",")[:-1], dtype=np.int64)
+        exon_ends = np.array(self.info["exonEnds"].item().split(",")[:-1], dtype=np.int64)
+        # trim the first and last exons to the coding region
+        if exon_starts.size:
+            exon_starts[0] = max(self.coding_start, exon_starts[0])
+        if exon_ends.size > 1:
+            exon_ends[-1] = min(self.coding_end, exon_ends[-1])
+        self.coding_exons = list(zip(exon_starts.tolist(), exon_ends.tolist()))
         self.n_coding_exons = len(self.coding_exons)
         self.start = self.info["txStart"].item() - window
         self.end = self.info["txEnd"].item() + window
-        self.chrom = gene_dat.query("index == @self.official_gene_symbol")[
-            "chrom"
-        ].item()
+        self.chrom = self.info["chrom"].item()
 
-    def get_coding_positions_and_starts(self):
-        coding_positions = []
-        coding_exon_starts = []
-        for start, stop in self.coding_exons:
-            coding_positions.extend(list(range(start, stop + 1)))
-            coding_exon_starts.append(start)
-        return coding_positions, coding_exon_starts
+    def get_coding_exon_bounds(self):
+        coding_exon_starts = np.fromiter(
+            (start for start, _ in self.coding_exons), dtype=np.int64, count=self.n_coding_exons
+        )
+        coding_exon_ends = np.fromiter(
+            (stop for _, stop in self.coding_exons), dtype=np.int64, count=self.n_coding_exons
+        )
+        return coding_exon_starts, coding_exon_ends
 
 
 def check_bcftools():
@@ -260,22 +321,333 @@ def pair_guides(guides_df, variant1, variant2):
     return guides_out
 
 
-def targ_var(row, cas, hap, level="lax"):
-    var = row["pos"]
-    if level == "strict":
-        if hap == 1:
-            return annots_file.query("pos == @var")[[f"makes_{cas}"]].values.any()
-        elif hap == 2:
-            return annots_file.query("pos == @var")[[f"breaks_{cas}"]].values.any()
-    else:
-        if hap == 1:
-            return annots_file.query("pos == @var")[
-                [f"makes_{cas}", f"var_near_{cas}"]
-            ].values.any()
-        if hap == 2:
-            return annots_file.query("pos == @var")[
-                [f"breaks_{cas}", f"var_near_{cas}"]
-            ].values.any()
+def eval_cas(
+    cas,
+    make_pam,
+    break_pam,
+    near_pam,
+    annot_pos,
+    targ_pairs_df,
+    pair_bits,
+    inds_w_targ_pair,
+    hap_labels,
+    args,
+):
+    """
+    Determine which individuals with a targetable pair of variants are targetable by a Cas variety.
+    :param cas: Cas variety, str.
+    :param make_pam: whether each annotated variant makes a PAM for this Cas, NumPy bool array.
+    :param break_pam: whether each annotated variant breaks a PAM for this Cas, NumPy bool array.
+    :param near_pam: whether each annotated variant is near a PAM for this Cas, NumPy bool array
+        (None when running as strict).
+    :param annot_pos: positions of the annotated variants, NumPy array.
+    :param targ_pairs_df: targetable variant pairs, Pandas DataFrame with var1 and var2 columns.
+    :param pair_bits: packed het bitmaps of individuals carrying both variants of each pair, NumPy array.
+    :param inds_w_targ_pair: targetable variant pairs carried by each individual, dict of Pandas DataFrames.
+    :param hap_labels: haplotype label of each variant per individual, Pandas DataFrame indexed by position.
+    :param args: docopt arguments, dict.
+    :return: whether each individual is targetable, list of bool, and when running as exhaustive the
+        targetable pairs for each individual, Pandas DataFrame (otherwise None).
+    """
+    logging.info(f"Evaluating gene targetability for {cas}")
+    # positions that make, break or are near a PAM for this cas, found once rather than for
+    # every individual
+    make_pam_pos = annot_pos[make_pam]
+    break_pam_pos = annot_pos[break_pam]
+    targ_cas = make_pam | break_pam
+    if not args["-s"]:
+        near_pam_pos = annot_pos[near_pam]
+        targ_cas |= near_pam
+    targ_vars_cas = annot_pos[targ_cas]
+    if args["--exhaustive"]:
+        exh_df_list = []
+    # individuals carrying at least one pair targetable by this cas
+    cas_pairs = targ_pairs_df.isin(targ_vars_cas).all(axis=1).to_numpy()
+    has_cas_pair = np.unpackbits(
+        np.bitwise_or.reduce(pair_bits[cas_pairs], axis=0), count=len(inds_w_targ_pair)
+    ).astype(bool)
+    ind_targ_cas = []
+    for ind_ix, (ind, ind_targ_pairs) in enumerate(inds_w_targ_pair.items()):
+        if not args["--exhaustive"]:
+            if not has_cas_pair[ind_ix]:
+                ind_targ_cas.append(False)
+                continue
+            # don't need to check that pairs are on same haplotype if genotypes are not phased
+            elif args["--not_phased"]:
+                ind_targ_cas.append(True)
+                continue
+        # pairs for which both variants are targetable by this cas
+        ind_cas_targ_pairs = (
+            ind_targ_pairs.loc[ind_targ_pairs.isin(targ_vars_cas).all(axis=1)]
+            .drop_duplicates()
+            .copy()
+        )
+        if args["--exhaustive"]:
+            ind_targ_out = []
+            # check whether pairs of allele-specific cut sites is on the same haplotype in individual
+            if args["-s"]:
+                ind_cas_targ_pairs["var1_make_pam"] = ind_cas_targ_pairs[
+                    "var1"
+                ].isin(make_pam_pos)
+                ind_cas_targ_pairs["var2_make_pam"] = ind_cas_targ_pairs[
+                    ["var2"]
+                ].isin(make_pam_pos)
+                ind_cas_targ_pairs["var1_break_pam"] = ind_cas_targ_pairs[
+                    ["var1"]
+                ].isin(break_pam_pos)
+                ind_cas_targ_pairs["var2_break_pam"] = ind_cas_targ_pairs[
+                    ["var2"]
+                ].isin(break_pam_pos)
+                ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
+                    ["var1_make_pam", "var2_make_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
+                    ["var1_break_pam", "var2_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["one_make_one_break_1"] = ind_cas_targ_pairs[
+                    ["var1_make_pam", "var2_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["one_make_one_break_2"] = ind_cas_targ_pairs[
+                    ["var2_make_pam", "var1_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["same_hap"] = same_hap(ind_cas_targ_pairs, hap_labels[ind])
+                ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs["same_hap"]
+
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query("both_make and same_hap")[
+                        ["var1", "var2"]
+                    ]
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query("both_break and same_hap")[
+                        ["var1", "var2"]
+                    ]
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query(
+                        "one_make_one_break_1 and not_same_hap"
+                    )[["var1", "var2"]]
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query(
+                        "one_make_one_break_2 and not_same_hap"
+                    )[["var1", "var2"]]
+                )
+                ind_targ_out_df = pd.concat(ind_targ_out).dropna().drop_duplicates()
+                ind_targ_out_df["ind"] = ind
+                exh_df_list.append(ind_targ_out_df)
+            else:
+                # if both near PAM, haplotype doesn't have to be the same because both are allele-specific sgRNA sites
+                ind_cas_targ_pairs["both_near_pam"] = (
+                    ind_cas_targ_pairs[["var1", "var2"]]
+                    .isin(near_pam_pos)
+                    .all(axis=1)
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query("both_near_pam")[["var1", "var2"]]
+                )
+                #   when both make or break, need to be same hap
+                ind_cas_targ_pairs["var1_make_pam"] = ind_cas_targ_pairs[
+                    "var1"
+                ].isin(make_pam_pos)
+                ind_cas_targ_pairs["var2_make_pam"] = ind_cas_targ_pairs[
+                    "var2"
+                ].isin(make_pam_pos)
+                ind_cas_targ_pairs["var1_near_pam"] = ind_cas_targ_pairs[
+                    "var1"
+                ].isin(near_pam_pos)
+                ind_cas_targ_pairs["var2_near_pam"] = ind_cas_targ_pairs[
+                    "var2"
+                ].isin(near_pam_pos)
+                ind_cas_targ_pairs["var1_break_pam"] = ind_cas_targ_pairs[
+                    "var1"
+                ].isin(break_pam_pos)
+                ind_cas_targ_pairs["var2_break_pam"] = ind_cas_targ_pairs[
+                    "var2"
+                ].isin(break_pam_pos)
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query(
+                        "(var1_near_pam and var2_make_pam) or (var1_near_pam and var2_break_pam) or (var2_near_pam and var1_make_pam) or (var2_near_pam and var1_break_pam)"
+                    )[["var1", "var2"]]
+                )
+                ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
+                    ["var1_make_pam", "var2_make_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
+                    ["var1_break_pam", "var2_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["one_make_one_break_1"] = ind_cas_targ_pairs[
+                    ["var1_make_pam", "var2_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["one_make_one_break_2"] = ind_cas_targ_pairs[
+                    ["var2_make_pam", "var1_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["same_hap"] = same_hap(ind_cas_targ_pairs, hap_labels[ind])
+                ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs["same_hap"]
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query("both_make and same_hap")[
+                        ["var1", "var2"]
+                    ]
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query("both_break and same_hap")[
+                        ["var1", "var2"]
+                    ]
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query(
+                        "one_make_one_break_1 and not_same_hap"
+                    )[["var1", "var2"]]
+                )
+                ind_targ_out.append(
+                    ind_cas_targ_pairs.query(
+                        "one_make_one_break_2 and not_same_hap"
+                    )[["var1", "var2"]]
+                )
+                ind_targ_out_df = pd.concat(ind_targ_out).dropna().drop_duplicates()
+                ind_targ_out_df["ind"] = ind
+                exh_df_list.append(ind_targ_out_df)
+        if ind_cas_targ_pairs.empty:
+            ind_targ_cas.append(False)
+            continue
+        else:
+            # check that at least one pair of allele-specific cut sites is on the same haplotype in individual
+            if args["-s"]:
+                ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
+                    ["var1_make_pam", "var2_make_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
+                    ["var1_break_pam", "var2_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["one_make_one_break_1"] = ind_cas_targ_pairs[
+                    ["var1_make_pam", "var2_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["one_make_one_break_2"] = ind_cas_targ_pairs[
+                    ["var2_make_pam", "var1_break_pam"]
+                ].all(axis=1)
+                ind_cas_targ_pairs["same_hap"] = same_hap(ind_cas_targ_pairs, hap_labels[ind])
+                ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs["same_hap"]
+                if (
+                    ind_cas_targ_pairs[["both_make", "same_hap"]].all(axis=1).any()
+                    or ind_cas_targ_pairs[["both_break", "same_hap"]]
+                    .all(axis=1)
+                    .any()
+                ):
+                    ind_targ_cas.append(True)
+                    continue
+                # check if pair where one makes, one breaks a PAM, and on different haplotypes
+                elif (
+                    ind_cas_targ_pairs[["one_make_one_break_1", "not_same_hap"]]
+                    .all(axis=1)
+                    .any()
+                    or ind_cas_targ_pairs[["one_make_one_break_2", "not_same_hap"]]
+                    .all(axis=1)
+                    .any()
+                ):
+                    ind_targ_cas.append(True)
+                    continue
+                # all possibilities exhausted, this person just isn't targetable at this gene
+                else:
+                    ind_targ_cas.append(False)
+                    continue
+            else:
+                # if both near PAM, haplotype doesn't have to be the same because both are allele-specific sgRNA sites
+                ind_cas_targ_pairs["both_near_pam"] = (
+                    ind_cas_targ_pairs[["var1", "var2"]]
+                    .isin(near_pam_pos)
+                    .all(axis=1)
+                )
+                if ind_cas_targ_pairs[
+                    "both_near_pam"
+                ].any():  # this doesn't work for "strict" mode
+                    ind_targ_cas.append(True)
+                    continue
+                else:
+                    # if none have both near a PAM, when both make or break, need to be same hap
+                    ind_cas_targ_pairs["var1_make_pam"] = ind_cas_targ_pairs[
+                        "var1"
+                    ].isin(make_pam_pos)
+                    ind_cas_targ_pairs["var2_make_pam"] = ind_cas_targ_pairs[
+                        ["var2"]
+                    ].isin(make_pam_pos)
+                    ind_cas_targ_pairs["var1_near_pam"] = ind_cas_targ_pairs[
+                        "var1"
+                    ].isin(near_pam_pos)
+                    ind_cas_targ_pairs["var2_near_pam"] = ind_cas_targ_pairs[
+                        "var2"
+                    ].isin(near_pam_pos)
+                    ind_cas_targ_pairs["var1_break_pam"] = ind_cas_targ_pairs[
+                        ["var1"]
+                    ].isin(break_pam_pos)
+                    ind_cas_targ_pairs["var2_break_pam"] = ind_cas_targ_pairs[
+                        ["var2"]
+                    ].isin(break_pam_pos)
+                    # if one var is near a pam and the other makes/breaks, haplotype doesn't matter
+                    if not ind_cas_targ_pairs.query(
+                        "(var1_near_pam and var2_make_pam) or (var1_near_pam and var2_break_pam) or (var2_near_pam and var1_make_pam) or (var2_near_pam and var1_break_pam)"
+                    ).empty:
+                        ind_targ_cas.append(True)
+                        continue
+                    else:
+                        ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
+                            ["var1_make_pam", "var2_make_pam"]
+                        ].all(axis=1)
+                        ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
+                            ["var1_break_pam", "var2_break_pam"]
+                        ].all(axis=1)
+                        ind_cas_targ_pairs[
+                            "one_make_one_break_1"
+                        ] = ind_cas_targ_pairs[
+                            ["var1_make_pam", "var2_break_pam"]
+                        ].all(
+                            axis=1
+                        )
+                        ind_cas_targ_pairs[
+                            "one_make_one_break_2"
+                        ] = ind_cas_targ_pairs[
+                            ["var2_make_pam", "var1_break_pam"]
+                        ].all(
+                            axis=1
+                        )
+                        ind_cas_targ_pairs["same_hap"] = same_hap(ind_cas_targ_pairs, hap_labels[ind])
+                        ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs[
+                            "same_hap"
+                        ]
+                        if (
+                            ind_cas_targ_pairs[["both_make", "same_hap"]]
+                            .all(axis=1)
+                            .any()
+                            or ind_cas_targ_pairs[["both_break", "same_hap"]]
+                            .all(axis=1)
+                            .any()
+                        ):
+                            ind_targ_cas.append(True)
+                            continue
+                        # check if pair where one makes, one breaks a PAM, and on different haplotypes
+                        elif (
+                            ind_cas_targ_pairs[
+                                ["one_make_one_break_1", "not_same_hap"]
+                            ]
+                            .all(axis=1)
+                            .any()
+                            or ind_cas_targ_pairs[
+                                ["one_make_one_break_2", "not_same_hap"]
+                            ]
+                            .all(axis=1)
+                            .any()
+                        ):
+                            ind_targ_cas.append(True)
+                            continue
+                        # all possibilities exhausted, this person just isn't targetable at this gene
+                        else:
+                            ind_targ_cas.append(False)
+                            continue
+
+    if args["--exhaustive"]:
+        exh_df = pd.concat(exh_df_list)
+        exh_df[f"targ_{cas}"] = cas
+        return ind_targ_cas, exh_df
+    return ind_targ_cas, None
 
 
 def norm_chr(chrom_str, gens_chrom):
@@ -295,7 +667,6 @@ def main(args):
 
     gene_dat = load_gene_gene_dat(args["<gene_dat>"])
     gene = args["<gene>"]
-    global annots_file
     annots_file = args["<annots_file>"]
     out_prefix = args["<out>"]
     maxcut = int(args["<maxcut>"])
@@ -340,9 +711,17 @@ def main(args):
         )
 
     # load targetability information for each variant
+    # only read the annotation columns for the requested Cas varieties and strictness level
+    annot_types = ("makes", "breaks") if args["-s"] else ("makes", "breaks", "var_near")
+    flag_cols = [f"{annot}_{cas}" for cas in cas_list_append for annot in annot_types]
     annots_file = pd.read_hdf(
-        annots_file, "all", where=f"pos >= {MyGene.start} and pos <= {MyGene.end}"
+        annots_file,
+        "all",
+        where=f"(pos >= {MyGene.start}) & (pos <= {MyGene.end})",
+        columns=["pos"] + flag_cols,
     )
+    # cast the PAM annotation flags in one vectorized conversion so later queries scan bool columns
+    annots_file[flag_cols] = annots_file[flag_cols].astype(bool)
 
     # check whether there are annotated variants for this gene, abort otherwise
 
@@ -371,38 +750,26 @@ def main(args):
 
     chrom = norm_chr(MyGene.chrom, vcf_chrom.startswith("chr"))
 
-    bcl_v = f'bcftools view -g "het" -r {chrom}:{MyGene.start}-{MyGene.end} -H {bcf}'
-
-    samples_cmd = f"bcftools query -l {bcf}"
-    bcl_samps = subprocess.Popen(samples_cmd, shell=True, stdout=subprocess.PIPE)
-    samples = bcl_samps.communicate()[0].decode("utf-8").split("\n")[:-1]
-
-    # check that user specified cohort if the VCF contains >1 samples
-
-    col_names = [
-        "chrom",
-        "pos",
-        "rsid",
-        "ref",
-        "alt",
-        "score",
-        "random",
-        "info",
-        "gt",
-    ] + samples
-    bcl_view = subprocess.Popen(bcl_v, shell=True, stdout=subprocess.PIPE)
-    gens = pd.read_csv(
-        StringIO(bcl_view.communicate()[0].decode("utf-8")),
-        sep="\t",
-        header=None,
-        names=col_names,
-        usecols=["chrom", "pos", "ref", "alt"] + samples,
+    # only emit the fields used below, and stream them straight into the parser
+    bcl_v = (
+        f'bcftools view -g "het" -r {chrom}:{MyGene.start}-{MyGene.end} -Ou {bcf} | '
+        'bcftools query -H -f "%CHROM\\t%POS\\t%REF\\t%ALT[\\t%GT]\\n"'
     )
+    bcl_view = subprocess.Popen(bcl_v, shell=True, stdout=subprocess.PIPE, bufsize=1 << 20)
+
+    # sample names come from the -H header (e.g. [5]NA12878:GT), saving a separate bcftools query -l
+    header = bcl_view.stdout.readline().decode("utf-8").rstrip("\n").split("\t")
+    samples = [field.split("]", 1)[1].rsplit(":", 1)[0] for field in header[4:]]
+
+    col_names = ["chrom", "pos", "ref", "alt"] + samples
+    gens = pd.read_csv(bcl_view.stdout, sep="\t", header=None, names=col_names)
+    bcl_view.wait()
     logging.info("Genotypes loaded.")
 
-    het_gens = gens[samples].applymap(het).copy()
+    het_gens = pd.DataFrame(het_matrix(gens[samples]), index=gens.index, columns=samples)
 
-    enough_hets = list(het_gens.sum(axis=0).loc[lambda s: s >= 2].index)
+    het_counts = het_gens.to_numpy().sum(axis=0)
+    enough_hets = list(het_gens.columns[het_counts >= 2])
 
     logging.info(str(len(enough_hets)) + " individuals have >= 2 het positions.")
 
@@ -416,36 +783,15 @@ def main(args):
         "Checking targetability of individuals with sufficient number of hets."
     )
 
-    # get variants in region
-
-    variants = sorted(gens.pos)
-
-    # set up targetability analyses
-
-    het_vars_per_ind = {}  # get heterozygous variant positions for each individual
-
-    for ind in enough_hets:
-        het_vars_per_ind[ind] = gens.pos[het_gens[ind]].tolist()
-
     # get variant combinations and extract targetable pairs
 
     logging.info("Getting variant combos.")
 
-    variant1 = []
-    variant2 = []
-
-    coding_positions, coding_exon_starts = MyGene.get_coding_positions_and_starts()
+    coding_exon_starts, coding_exon_ends = MyGene.get_coding_exon_bounds()
 
-    for var1, var2 in itertools.product(variants, repeat=2):
-        if (
-            (var1 != var2)
-            and (max([var1, var2]) <= min([var1, var2]) + maxcut)
-            and (targ_pair(var1, var2, coding_positions, coding_exon_starts))
-        ):
-            variant1.append(var1)
-            variant2.append(var2)
-        else:
-            continue
+    variant1, variant2 = get_targ_pairs(
+        gens.pos.to_numpy(), maxcut, coding_exon_starts, coding_exon_ends
+    )
 
     logging.info("Combos obtained.")
 
@@ -455,22 +801,32 @@ def main(args):
         "var1 < var2"
     )
 
+    # set up targetability analyses, only for variants that are part of a targetable pair
+
+    eligible = gens.pos.isin(targ_pairs_df.to_numpy().ravel()).to_numpy()
+    gens = gens[eligible]
+    het_gens = het_gens[eligible]
+
+    # heterozygous variant positions for each individual, one (sample, pos) row per het call
+    het_long = (
+        het_gens[enough_hets].set_index(gens.pos).rename_axis(columns="sample").stack()
+    )
+    het_long = het_long[het_long].reset_index()[["sample", "pos"]].drop_duplicates()
+
     # check that each individual that has enough hets also has at least one of these pairs
-    # and specify which pairs they have
+    # and specify which pairs they have, by joining the pairs to every individual's het
+    # positions on both variants at once
 
-    inds_w_targ_pair = {}
+    ind_pairs = targ_pairs_df.merge(het_long, left_on="var1", right_on="pos").merge(
+        het_long, left_on=["var2", "sample"], right_on=["pos", "sample"]
+    )
+    ind_pairs = dict(tuple(ind_pairs.groupby("sample", sort=False)))
 
-    for ind in het_vars_per_ind.keys():
-        ind_vars = het_vars_per_ind[ind]
-        ind_targ_pairs = (
-            targ_pairs_df.loc[targ_pairs_df.isin(ind_vars).all(axis=1)]
-            .reset_index(drop=True)
-            .copy()
-        )
-        if ind_targ_pairs.empty:
-            continue
-        else:
-            inds_w_targ_pair[ind] = ind_targ_pairs
+    inds_w_targ_pair = {
+        ind: ind_pairs[ind][["var1", "var2"]].reset_index(drop=True)
+        for ind in enough_hets
+        if ind in ind_pairs
+    }
 
     logging.info(
         f"{len(inds_w_targ_pair.keys())} individuals have at least one targetable pair of variants."
@@ -490,429 +846,68 @@ def main(args):
 
     finaltargcols = []  # keeps track of columns for all cas types for later evaluating "all" condition
 
+    # relabel genotypes by haplotype once for all individuals, rather than per individual and cas.
+    # pairs are keyed on position alone, so where a position is split over several records (e.g.
+    # multiallelic sites split by bcftools norm -m-) each individual takes the label of the first
+    # record they are het on, falling back to the first record if they are het on none
+    inds = list(inds_w_targ_pair.keys())
+    gen_labels = gens[inds].replace(HAP_LABELS)
+    hap_labels = (
+        gen_labels.where(het_gens[inds].to_numpy())
+        .groupby(gens.pos.to_numpy())
+        .first()
+        .fillna(gen_labels.groupby(gens.pos.to_numpy()).first())
+    )
+
+    # het status of individuals with a targetable pair packed 8 to a byte per variant position, so
+    # which individuals carry both variants of each pair is one bitwise AND per pair
+    het_pos = het_gens[list(inds_w_targ_pair.keys())].groupby(gens.pos.to_numpy()).any()
+    het_bits = np.packbits(het_pos.to_numpy(), axis=1)
+    pair_bits = (
+        het_bits[het_pos.index.get_indexer(targ_pairs_df.var1)]
+        & het_bits[het_pos.index.get_indexer(targ_pairs_df.var2)]
+    )
+
     if args["--exhaustive"]:
-        # val_occurrences = []  # steps towards longform dataframe with one row per ind/het combo
-        # for val in het_vars_per_ind.values():
-        #     val_occurrences.append(len(val))
-        # targ_haps = pd.DataFrame({'sample': np.repeat(list(het_vars_per_ind.keys()), val_occurrences),
-        #                           'pos': list(itertools.chain.from_iterable(het_vars_per_ind.values()))})
         overall_exh_list = []
 
-    for cas in cas_list[1:]:  # skip all because is handled below faster
-        logging.info(f"Evaluating gene targetability for {cas}")
-        if args["-s"]:
-            targ_vars_cas = annots_file.query(
-                f"(makes_{cas}) or (breaks_{cas})"
-            ).pos.tolist()
-        else:
-            targ_vars_cas = annots_file.query(
-                f"(var_near_{cas}) or (makes_{cas}) or (breaks_{cas})"
-            ).pos.tolist()
-        targ_pairs_cas = (
-            targ_pairs_df.loc[targ_pairs_df.isin(targ_vars_cas).all(axis=1)]
-            .reset_index(drop=True)
-            .copy()
-        )
-        if args["--exhaustive"]:
-            exh_df_list = []
-        # eliminate individuals that do not have at least one targetable pair for this specific cas
-        ind_targ_cas = []
-        for ind in list(inds_w_targ_pair.keys()):
-            ind_cas_targ_pairs = (
-                inds_w_targ_pair[ind]
-                .merge(targ_pairs_cas, how="inner")
-                .drop_duplicates()
-            )
-            if args["--exhaustive"]:
-                ind_targ_out = []
-                # check whether pairs of allele-specific cut sites is on the same haplotype in individual
-                if args["-s"]:
-                    ind_cas_targ_pairs["var1_make_pam"] = ind_cas_targ_pairs[
-                        "var1"
-                    ].isin(annots_file.query(f"makes_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var2_make_pam"] = ind_cas_targ_pairs[
-                        ["var2"]
-                    ].isin(annots_file.query(f"makes_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var1_break_pam"] = ind_cas_targ_pairs[
-                        ["var1"]
-                    ].isin(annots_file.query(f"breaks_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var2_break_pam"] = ind_cas_targ_pairs[
-                        ["var2"]
-                    ].isin(annots_file.query(f"breaks_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
-                        ["var1_make_pam", "var2_make_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
-                        ["var1_break_pam", "var2_break_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["one_make_one_break_1"] = ind_cas_targ_pairs[
-                        ["var1_make_pam", "var2_break_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["one_make_one_break_2"] = ind_cas_targ_pairs[
-                        ["var2_make_pam", "var1_break_pam"]
-                    ].all(axis=1)
-                    gens_replace = {
-                        "0|1": "hap2",
-                        "0|2": "hap2",
-                        "0|3": "hap2",
-                        "1|0": "hap1",
-                        "2|0": "hap1",
-                        "3|0": "hap1",
-                        "0|0": "not_het",
-                        "1|1": "not_het",
-                    }
-                    ind_gens = gens[["pos", ind]].replace(gens_replace).copy()
-                    ind_cas_targ_pairs["var1_hap"] = pd.merge(
-                        ind_cas_targ_pairs.copy(),
-                        ind_gens.copy(),
-                        left_on="var1",
-                        right_on="pos",
-                        how="left",
-                    )[ind]
-                    ind_cas_targ_pairs["var2_hap"] = pd.merge(
-                        ind_cas_targ_pairs.copy(),
-                        ind_gens.copy(),
-                        left_on="var2",
-                        right_on="pos",
-                        how="left",
-                    )[ind]
-                    ind_cas_targ_pairs["same_hap"] = np.where(
-                        ind_cas_targ_pairs["var1_hap"]
-                        == ind_cas_targ_pairs["var2_hap"],
-                        True,
-                        False,
-                    )
-                    ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs["same_hap"]
-
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query("both_make and same_hap")[
-                            ["var1", "var2"]
-                        ]
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query("both_break and same_hap")[
-                            ["var1", "var2"]
-                        ]
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query(
-                            "one_make_one_break_1 and not_same_hap"
-                        )[["var1", "var2"]]
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query(
-                            "one_make_one_break_2 and not_same_hap"
-                        )[["var1", "var2"]]
-                    )
-                    ind_targ_out_df = pd.concat(ind_targ_out).dropna().drop_duplicates()
-                    ind_targ_out_df["ind"] = ind
-                    exh_df_list.append(ind_targ_out_df)
-                else:
-                    # if both near PAM, haplotype doesn't have to be the same because both are allele-specific sgRNA sites
-                    ind_cas_targ_pairs["both_near_pam"] = (
-                        ind_cas_targ_pairs[["var1", "var2"]]
-                        .isin(annots_file.query(f"var_near_{cas}").pos.tolist())
-                        .all(axis=1)
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query("both_near_pam")[["var1", "var2"]]
-                    )
-                    #   when both make or break, need to be same hap
-                    ind_cas_targ_pairs["var1_make_pam"] = ind_cas_targ_pairs[
-                        "var1"
-                    ].isin(annots_file.query(f"makes_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var2_make_pam"] = ind_cas_targ_pairs[
-                        "var2"
-                    ].isin(annots_file.query(f"makes_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var1_near_pam"] = ind_cas_targ_pairs[
-                        "var1"
-                    ].isin(annots_file.query(f"var_near_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var2_near_pam"] = ind_cas_targ_pairs[
-                        "var2"
-                    ].isin(annots_file.query(f"var_near_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var1_break_pam"] = ind_cas_targ_pairs[
-                        "var1"
-                    ].isin(annots_file.query(f"breaks_{cas}").pos.tolist())
-                    ind_cas_targ_pairs["var2_break_pam"] = ind_cas_targ_pairs[
-                        "var2"
-                    ].isin(annots_file.query(f"breaks_{cas}").pos.tolist())
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query(
-                            "(var1_near_pam and var2_make_pam) or (var1_near_pam and var2_break_pam) or (var2_near_pam and var1_make_pam) or (var2_near_pam and var1_break_pam)"
-                        )[["var1", "var2"]]
-                    )
-                    ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
-                        ["var1_make_pam", "var2_make_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
-                        ["var1_break_pam", "var2_break_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["one_make_one_break_1"] = ind_cas_targ_pairs[
-                        ["var1_make_pam", "var2_break_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["one_make_one_break_2"] = ind_cas_targ_pairs[
-                        ["var2_make_pam", "var1_break_pam"]
-                    ].all(axis=1)
-                    gens_replace = {
-                        "0|1": "hap2",
-                        "0|2": "hap2",
-                        "0|3": "hap2",
-                        "1|0": "hap1",
-                        "2|0": "hap1",
-                        "3|0": "hap1",
-                        "0|0": "not_het",
-                        "1|1": "not_het",
-                    }
-                    ind_gens = gens[["pos", ind]].replace(gens_replace).copy()
-                    ind_cas_targ_pairs["var1_hap"] = pd.merge(
-                        ind_cas_targ_pairs.copy(),
-                        ind_gens.copy(),
-                        left_on="var1",
-                        right_on="pos",
-                        how="left",
-                    )[ind]
-                    ind_cas_targ_pairs["var2_hap"] = pd.merge(
-                        ind_cas_targ_pairs.copy(),
-                        ind_gens.copy(),
-                        left_on="var2",
-                        right_on="pos",
-                        how="left",
-                    )[ind]
-                    ind_cas_targ_pairs["same_hap"] = np.where(
-                        ind_cas_targ_pairs["var1_hap"]
-                        == ind_cas_targ_pairs["var2_hap"],
-                        True,
-                        False,
-                    )
-                    ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs["same_hap"]
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query("both_make and same_hap")[
-                            ["var1", "var2"]
-                        ]
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query("both_break and same_hap")[
-                            ["var1", "var2"]
-                        ]
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query(
-                            "one_make_one_break_1 and not_same_hap"
-                        )[["var1", "var2"]]
-                    )
-                    ind_targ_out.append(
-                        ind_cas_targ_pairs.query(
-                            "one_make_one_break_2 and not_same_hap"
-                        )[["var1", "var2"]]
-                    )
-                    ind_targ_out_df = pd.concat(ind_targ_out).dropna().drop_duplicates()
-                    ind_targ_out_df["ind"] = ind
-                    exh_df_list.append(ind_targ_out_df)
-                exh_df = pd.concat(exh_df_list)
-                exh_df[f"targ_{cas}"] = cas
-                overall_exh_list.append(exh_df)
-            if ind_cas_targ_pairs.empty:
-                ind_targ_cas.append(False)
-                continue
-            # don't need to check that pairs are on same haplotype if genotypes are not phased, unless if outputting hap_targs
-            elif args["--not_phased"] and not args["--exhaustive"]:
-                ind_targ_cas.append(True)
-                continue
-            else:
-                # check that at least one pair of allele-specific cut sites is on the same haplotype in individual
-                if args["-s"]:
-                    ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
-                        ["var1_make_pam", "var2_make_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
-                        ["var1_break_pam", "var2_break_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["one_make_one_break_1"] = ind_cas_targ_pairs[
-                        ["var1_make_pam", "var2_break_pam"]
-                    ].all(axis=1)
-                    ind_cas_targ_pairs["one_make_one_break_2"] = ind_cas_targ_pairs[
-                        ["var2_make_pam", "var1_break_pam"]
-                    ].all(axis=1)
-                    gens_replace = {
-                        "0|1": "hap2",
-                        "0|2": "hap2",
-                        "0|3": "hap2",
-                        "1|0": "hap1",
-                        "2|0": "hap1",
-                        "3|0": "hap1",
-                        "0|0": "not_het",
-                        "1|1": "not_het",
-                    }
-                    ind_gens = gens[["pos", ind]].replace(gens_replace).copy()
-                    ind_cas_targ_pairs["var1_hap"] = pd.merge(
-                        ind_cas_targ_pairs.copy(),
-                        ind_gens.copy(),
-                        left_on="var1",
-                        right_on="pos",
-                        how="left",
-                    )[ind]
-                    ind_cas_targ_pairs["var2_hap"] = pd.merge(
-                        ind_cas_targ_pairs.copy(),
-                        ind_gens.copy(),
-                        left_on="var2",
-                        right_on="pos",
-                        how="left",
-                    )[ind]
-                    ind_cas_targ_pairs["same_hap"] = np.where(
-                        ind_cas_targ_pairs["var1_hap"]
-                        == ind_cas_targ_pairs["var2_hap"],
-                        True,
-                        False,
-                    )
-                    ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs["same_hap"]
-                    if (
-                        ind_cas_targ_pairs[["both_make", "same_hap"]].all(axis=1).any()
-                        or ind_cas_targ_pairs[["both_break", "same_hap"]]
-                        .all(axis=1)
-                        .any()
-                    ):
-                        ind_targ_cas.append(True)
-                        continue
-                    # check if pair where one makes, one breaks a PAM, and on different haplotypes
-                    elif (
-                        ind_cas_targ_pairs[["one_make_one_break_1", "not_same_hap"]]
-                        .all(axis=1)
-                        .any()
-                        or ind_cas_targ_pairs[["one_make_one_break_2", "not_same_hap"]]
-                        .all(axis=1)
-                        .any()
-                    ):
-                        ind_targ_cas.append(True)
-                        continue
-                    # all possibilities exhausted, this person just isn't targetable at this gene
-                    else:
-                        ind_targ_cas.append(False)
-                        continue
-                else:
-                    # if both near PAM, haplotype doesn't have to be the same because both are allele-specific sgRNA sites
-                    ind_cas_targ_pairs["both_near_pam"] = (
-                        ind_cas_targ_pairs[["var1", "var2"]]
-                        .isin(annots_file.query(f"var_near_{cas}").pos.tolist())
-                        .all(axis=1)
-                    )
-                    if ind_cas_targ_pairs[
-                        "both_near_pam"
-                    ].any():  # this doesn't work for "strict" mode
-                        ind_targ_cas.append(True)
-                        continue
-                    else:
-                        # if none have both near a PAM, when both make or break, need to be same hap
-                        ind_cas_targ_pairs["var1_make_pam"] = ind_cas_targ_pairs[
-                            "var1"
-                        ].isin(annots_file.query(f"makes_{cas}").pos.tolist())
-                        ind_cas_targ_pairs["var2_make_pam"] = ind_cas_targ_pairs[
-                            ["var2"]
-                        ].isin(annots_file.query(f"makes_{cas}").pos.tolist())
-                        ind_cas_targ_pairs["var1_near_pam"] = ind_cas_targ_pairs[
-                            "var1"
-                        ].isin(annots_file.query(f"var_near_{cas}").pos.tolist())
-                        ind_cas_targ_pairs["var2_near_pam"] = ind_cas_targ_pairs[
-                            "var2"
-                        ].isin(annots_file.query(f"var_near_{cas}").pos.tolist())
-                        ind_cas_targ_pairs["var1_break_pam"] = ind_cas_targ_pairs[
-                            ["var1"]
-                        ].isin(annots_file.query(f"breaks_{cas}").pos.tolist())
-                        ind_cas_targ_pairs["var2_break_pam"] = ind_cas_targ_pairs[
-                            ["var2"]
-                        ].isin(annots_file.query(f"breaks_{cas}").pos.tolist())
-                        # if one var is near a pam and the other makes/breaks, haplotype doesn't matter
-                        if not ind_cas_targ_pairs.query(
-                            "(var1_near_pam and var2_make_pam) or (var1_near_pam and var2_break_pam) or (var2_near_pam and var1_make_pam) or (var2_near_pam and var1_break_pam)"
-                        ).empty:
-                            ind_targ_cas.append(True)
-                            continue
-                        else:
-                            ind_cas_targ_pairs["both_make"] = ind_cas_targ_pairs[
-                                ["var1_make_pam", "var2_make_pam"]
-                            ].all(axis=1)
-                            ind_cas_targ_pairs["both_break"] = ind_cas_targ_pairs[
-                                ["var1_break_pam", "var2_break_pam"]
-                            ].all(axis=1)
-                            ind_cas_targ_pairs[
-                                "one_make_one_break_1"
-                            ] = ind_cas_targ_pairs[
-                                ["var1_make_pam", "var2_break_pam"]
-                            ].all(
-                                axis=1
-                            )
-                            ind_cas_targ_pairs[
-                                "one_make_one_break_2"
-                            ] = ind_cas_targ_pairs[
-                                ["var2_make_pam", "var1_break_pam"]
-                            ].all(
-                                axis=1
-                            )
-                            gens_replace = {
-                                "0|1": "hap2",
-                                "0|2": "hap2",
-                                "0|3": "hap2",
-                                "1|0": "hap1",
-                                "2|0": "hap1",
-                                "3|0": "hap1",
-                                "0|0": "not_het",
-                                "1|1": "not_het",
-                            }
-                            ind_gens = gens[["pos", ind]].replace(gens_replace).copy()
-                            ind_cas_targ_pairs["var1_hap"] = pd.merge(
-                                ind_cas_targ_pairs.copy(),
-                                ind_gens.copy(),
-                                left_on="var1",
-                                right_on="pos",
-                                how="left",
-                            )[ind]
-                            ind_cas_targ_pairs["var2_hap"] = pd.merge(
-                                ind_cas_targ_pairs.copy(),
-                                ind_gens.copy(),
-                                left_on="var2",
-                                right_on="pos",
-                                how="left",
-                            )[ind]
-                            ind_cas_targ_pairs["same_hap"] = np.where(
-                                ind_cas_targ_pairs["var1_hap"]
-                                == ind_cas_targ_pairs["var2_hap"],
-                                True,
-                                False,
-                            )
-                            ind_cas_targ_pairs["not_same_hap"] = ~ind_cas_targ_pairs[
-                                "same_hap"
-                            ]
-                            if (
-                                ind_cas_targ_pairs[["both_make", "same_hap"]]
-                                .all(axis=1)
-                                .any()
-                                or ind_cas_targ_pairs[["both_break", "same_hap"]]
-                                .all(axis=1)
-                                .any()
-                            ):
-                                ind_targ_cas.append(True)
-                                continue
-                            # check if pair where one makes, one breaks a PAM, and on different haplotypes
-                            elif (
-                                ind_cas_targ_pairs[
-                                    ["one_make_one_break_1", "not_same_hap"]
-                                ]
-                                .all(axis=1)
-                                .any()
-                                or ind_cas_targ_pairs[
-                                    ["one_make_one_break_2", "not_same_hap"]
-                                ]
-                                .all(axis=1)
-                                .any()
-                            ):
-                                ind_targ_cas.append(True)
-                                continue
-                            # all possibilities exhausted, this person just isn't targetable at this gene
-                            else:
-                                ind_targ_cas.append(False)
-                                continue
+    # PAM annotations for all requested cas pulled out of the annotation table once, as
+    # annotated variants x cas bool arrays
+    annot_pos = annots_file.pos.to_numpy()
+    makes_pam = annots_file[[f"makes_{cas}" for cas in cas_list_append]].to_numpy()
+    breaks_pam = annots_file[[f"breaks_{cas}" for cas in cas_list_append]].to_numpy()
+    if not args["-s"]:
+        near_pam = annots_file[[f"var_near_{cas}" for cas in cas_list_append]].to_numpy()
+
+    cas_eval = partial(
+        eval_cas,
+        annot_pos=annot_pos,
+        targ_pairs_df=targ_pairs_df,
+        pair_bits=pair_bits,
+        inds_w_targ_pair=inds_w_targ_pair,
+        hap_labels=hap_labels,
+        args=args,
+    )
+    # skip all because is handled below faster
+    cas_cols = (
+        cas_list[1:],
+        makes_pam.T,
+        breaks_pam.T,
+        [None] * len(cas_list_append) if args["-s"] else near_pam.T,
+    )
+    # each cas is evaluated independently, so they can be farmed out to worker processes
+    n_procs = min(int(args["--procs"]), len(cas_list_append))
+    if n_procs > 1:
+        with ProcessPoolExecutor(max_workers=n_procs) as executor:
+            cas_results = list(executor.map(cas_eval, *cas_cols))
+    else:
+        cas_results = list(map(cas_eval, *cas_cols))
 
+    for cas, (ind_targ_cas, exh_df) in zip(cas_list[1:], cas_results):
         finaltargcols.append(f"targ_{cas}")
         final_targ[f"targ_{cas}"] = ind_targ_cas
+        if args["--exhaustive"]:
+            overall_exh_list.append(exh_df)
 
     # add column summarizing targetability across assessed Cas varieties
 
@@ -934,7 +929,7 @@ def main(args):
     with open(f"{out_prefix}genes_evaluated.txt", "a+") as f:
         f.write(f"{translated_gene_name}\n")
     # write gene dat to file
-    final_targ.to_hdf(f"{out_prefix}.h5", "all", comp_level=9, complib="blosc")
+    final_targ.to_hdf(f"{out_prefix}.h5", "all", complevel=1, complib="blosc:lz4")
     add_metadata(
         f"{out_prefix}.h5",
         args,
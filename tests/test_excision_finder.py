@@ -0,0 +1,68 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import ExcisionFinder as ef
+
+
+def brute_force_targ_pairs(variants, maxcut, coding_exons):
+    """Targetable pairs by the original definition, for comparison."""
+    coding = set()
+    for start, stop in coding_exons:
+        coding.update(range(start, stop + 1))
+    starts = [start for start, _ in coding_exons]
+    pairs = set()
+    for v1 in variants:
+        for v2 in variants:
+            low, high = min(v1, v2), max(v1, v2)
+            if v1 == v2 or high - low > maxcut:
+                continue
+            later = [start for start in starts if start > low]
+            if low in coding or high in coding or (later and high >= min(later)):
+                pairs.add((v1, v2))
+    return sorted(pairs)
+
+
+def test_targ_pairs_leading_utr_exons():
+    # cdsStart falls in the third exon, so the clipped first exon starts after the second and third
+    gene_dat = pd.DataFrame(
+        {
+            "chrom": ["chr1"],
+            "txStart": [100],
+            "txEnd": [500],
+            "cdsStart": [320],
+            "cdsEnd": [500],
+            "exonCount": [4],
+            "exonStarts": ["100,200,300,400,"],
+            "exonEnds": ["150,250,350,500,"],
+        },
+        index=["GENE1"],
+    )
+    gene = ef.Gene("GENE1", gene_dat, 0)
+    coding_exon_starts, coding_exon_ends = gene.get_coding_exon_bounds()
+    variants = np.array([60, 120, 180, 270, 330, 450])
+    var1, var2 = ef.get_targ_pairs(variants, 1000, coding_exon_starts, coding_exon_ends)
+    pairs = list(zip(var1.tolist(), var2.tolist()))
+    assert pairs == brute_force_targ_pairs(variants.tolist(), 1000, gene.coding_exons)
+    for pair in [(60, 270), (120, 270), (180, 270)]:
+        assert pair in pairs
+    assert not ef.in_coding(np.array([120, 320]), coding_exon_starts, coding_exon_ends)[0]
+    assert ef.in_coding(np.array([120, 320]), coding_exon_starts, coding_exon_ends)[1]
+
+
+def test_targ_pairs_repeated_positions():
+    # split multiallelic sites repeat a position; pairs come back in itertools.product order
+    coding_exon_starts = np.array([100, 300])
+    coding_exon_ends = np.array([200, 400])
+    variants = np.array([350, 150, 150, 180, 350, 900])
+    var1, var2 = ef.get_targ_pairs(variants, 500, coding_exon_starts, coding_exon_ends)
+    expected = [
+        (v1, v2)
+        for v1, v2 in itertools.product(sorted(variants.tolist()), repeat=2)
+        if v1 != v2 and abs(v1 - v2) <= 500
+    ]
+    assert list(zip(var1.tolist(), var2.tolist())) == expected